@@ -1,6 +1,6 @@
 import re
-import json
 import os
+import mmap
 
 # ----------------------------------------------------------------------
 # Script: vdscript_to_llc.py
@@ -28,7 +28,7 @@ import os
 #     below 0, the script will adjust the start frame to 0.
 #   - If the adjusted end frame becomes less than or equal to the adjusted start 
 #     frame (resulting in a non-positive duration), the script will skip that segment 
-#     and issue a warning.
+#     and issue a warning listing every skipped segment.
 #   - When using negative values, care must be taken to ensure that segments remain valid.
 #   - ABOUT THE "extra_frames_end" FEATURE:
 #     The "extra_frames_end" feature will not cause any problems if the 
@@ -51,25 +51,44 @@ import os
 #    - `fps`: Frame rate of your video (e.g., 23.976, 25). 
 #       CHECK AND SET THE FRAME RATE TO MATCH THE VIDEO BEING USED!!
 #       This is particularly important since the script's accuracy depends on it!
+#       NTSC frame rates (23.976, 29.97, 47.952, 59.94, 119.88) are automatically 
+#       treated as their exact values (e.g., 24000/1001).
 #    - `extra_frames_start`: Frames to add/remove at the beginning of each cut (can be negative).
 #    - `extra_frames_end`: Frames to add/remove at the end of each cut (can be negative).
 #    - `add_segment_number`: Set this to True to add numbering (e.g., "segment 1").
 # 3. Run the script.
+#
+# Batch conversion:
+#   To convert many .vdscript files at once, call `batch_convert` with a list 
+#   of dictionaries, each holding the arguments of `convert_vdscript_to_llc` 
+#   for one file (see the commented example in the "Usage example" section). 
+#   The files are converted in parallel, one worker process per CPU core.
 # ----------------------------------------------------------------------
 
-# Function to convert frame number to time in seconds
-def frames_to_timecode(frames, fps):
-    """
-    Converts a frame number to a timecode in seconds.
+# orjson serializes much faster than the standard library; fall back to json if it's not installed
+try:
+    import orjson
 
-    Args:
-        frames (int): The frame number.
-        fps (float): The frame rate of the video.
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    import json
 
-    Returns:
-        float: The timecode in seconds, rounded to 3 decimal places.
-    """
-    return round(frames / fps, 3)
+    def _dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+
+# Regex to match VirtualDub subset lines (e.g., VirtualDub.subset.AddRange(412,208);)
+_SUBSET_RE = re.compile(rb'^VirtualDub\.subset\.AddRange\((\d+),(\d+)\);', re.MULTILINE)
+
+# Exact frame durations (seconds per frame as numerator, denominator) of the NTSC frame rates,
+# keyed by their usual 3-decimal approximation (e.g., 23.976 is really 24000/1001 fps)
+_NTSC_FRAME_DURATIONS = {
+    23.976: (1001, 24000),
+    29.97: (1001, 30000),
+    47.952: (1001, 48000),
+    59.94: (1001, 60000),
+    119.88: (1001, 120000),
+}
 
 # Function to parse the .vdscript file and adjust frames for each cut
 def parse_vdscript(filepath, fps, extra_frames_start, extra_frames_end, add_segment_number=False):
@@ -86,51 +105,69 @@ def parse_vdscript(filepath, fps, extra_frames_start, extra_frames_end, add_segm
     Returns:
         list: A list of dictionaries representing cut segments with start and end times.
     """
-    cut_segments = []
-
-    with open(filepath, 'r') as file:
-        lines = file.readlines()
-    
-    # Regex to match VirtualDub subset lines (e.g., VirtualDub.subset.AddRange(412,208);)
-    subset_pattern = re.compile(r'VirtualDub\.subset\.AddRange\((\d+),(\d+)\);')
-
-    segment_number = 1  # Initialize the segment counter
-
-    for line in lines:
-        match = subset_pattern.match(line)
-        if match:
-            start_frame = int(match.group(1))
-            frame_count = int(match.group(2))
-            
-            # Adjust the start frame
-            new_start_frame = start_frame - extra_frames_start
-            # Ensure start frame is not negative
-            new_start_frame = max(new_start_frame, 0)
-            
-            # Adjust the end frame
-            new_end_frame = start_frame + frame_count + extra_frames_end
-
-            # Ensure end frame is greater than start frame
-            if new_end_frame <= new_start_frame:
-                print(f"Warning: Segment {segment_number} has non-positive duration after adjusting frames. Skipping this segment.")
-                segment_number += 1
-                continue
-
-            # Convert frames to time
-            start_time = frames_to_timecode(new_start_frame, fps)
-            end_time = frames_to_timecode(new_end_frame, fps)
-
-            # Name the segment with the segment number if requested
-            segment_name = f"segment {segment_number}" if add_segment_number else ""
-
-            # Append the segment to the list
-            cut_segments.append({
-                "start": start_time,
-                "end": end_time,
-                "name": segment_name
-            })
-
-            segment_number += 1  # Increment the segment number
+    # Memory-map the file and scan the raw bytes instead of building a decoded copy in memory
+    with open(filepath, 'rb') as file:
+        # mmap can't map an empty file, and an empty file has no cuts anyway
+        if os.fstat(file.fileno()).st_size == 0:
+            return []
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            # Cheap substring check before running the regex; scripts without any cuts need no scan at all
+            if buf.find(b'AddRange(') == -1:
+                return []
+
+            # Extract all (start frame, frame count) pairs in a single scan, then do the frame arithmetic in one pass
+            ranges = _SUBSET_RE.findall(buf)
+
+    # The number of ranges is known up front, so allocate the list once and trim off skipped segments at the end
+    cut_segments = [None] * len(ranges)
+    segment_count = 0
+    skipped_segments = []
+
+    # NTSC frame rates use exact integer arithmetic, which avoids rounding drift over long videos;
+    # any other frame rate simply divides by fps
+    frame_num, frame_den = _NTSC_FRAME_DURATIONS.get(round(fps, 3), (1, fps))
+
+    for segment_number, (start_frame, frame_count) in enumerate(ranges, start=1):
+        start_frame = int(start_frame)
+        frame_count = int(frame_count)
+
+        # Adjust the start frame
+        new_start_frame = start_frame - extra_frames_start
+        # Ensure start frame is not negative (a plain comparison is cheaper than calling max())
+        if new_start_frame < 0:
+            new_start_frame = 0
+
+        # Adjust the end frame
+        new_end_frame = start_frame + frame_count + extra_frames_end
+
+        # Ensure end frame is greater than start frame
+        if new_end_frame <= new_start_frame:
+            skipped_segments.append(segment_number)
+            continue
+
+        # Convert frames to time in seconds, rounded to 3 decimal places
+        start_time = round(new_start_frame * frame_num / frame_den, 3)
+        end_time = round(new_end_frame * frame_num / frame_den, 3)
+
+        # Name the segment with the segment number if requested
+        segment_name = f"segment {segment_number}" if add_segment_number else ""
+
+        # Store the segment in the next free slot
+        cut_segments[segment_count] = {
+            "start": start_time,
+            "end": end_time,
+            "name": segment_name
+        }
+        segment_count += 1
+
+    del cut_segments[segment_count:]
+
+    # Report all skipped segments at once rather than printing inside the loop
+    if len(skipped_segments) == 1:
+        print(f"Warning: Segment {skipped_segments[0]} has non-positive duration after adjusting frames. Skipping this segment.")
+    elif skipped_segments:
+        print(f"Warning: Segments {', '.join(map(str, skipped_segments))} have non-positive duration after adjusting frames. Skipping these segments.")
 
     return cut_segments
 
@@ -144,19 +181,29 @@ def write_llc_file(output_filepath, media_filename, cut_segments):
         media_filename (str): Name of the original media file.
         cut_segments (list): List of dictionaries representing cut segments.
     """
-    if os.path.exists(output_filepath):
-        print(f"Error: The file {output_filepath} already exists. Please choose a different filename or remove the existing file.")
-        return
-    
     llc_data = {
         "version": 1,
         "mediaFileName": media_filename,
         "cutSegments": cut_segments
     }
+    llc_bytes = _dumps(llc_data)
+
+    # Create the file exclusively so an existing file is never overwritten (O_BINARY prevents newline translation on Windows)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    try:
+        fd = os.open(output_filepath, flags, 0o666)
+    except FileExistsError:
+        print(f"Error: The file {output_filepath} already exists. Please choose a different filename or remove the existing file.")
+        return
+
+    # Write the serialized data straight to the file descriptor, bypassing Python's buffered file objects
+    try:
+        remaining = memoryview(llc_bytes)
+        while remaining:
+            remaining = remaining[os.write(fd, remaining):]
+    finally:
+        os.close(fd)
 
-    with open(output_filepath, 'w') as file:
-        json.dump(llc_data, file, indent=2)
-    
     print(f"LosslessCut file saved as {output_filepath}")
 
 # Main function to perform the conversion
@@ -179,6 +226,24 @@ def convert_vdscript_to_llc(vdscript_filepath, llc_filepath, media_filename, fps
     else:
         print("No valid segments to write to the LosslessCut file.")
 
+# Function to convert many .vdscript files in parallel
+def batch_convert(jobs, max_workers=None):
+    """
+    Converts several .vdscript files to .llc files in parallel, one file per worker process.
+
+    Args:
+        jobs (list): A list of dictionaries, each holding the keyword arguments of 
+                     `convert_vdscript_to_llc` for one file.
+        max_workers (int): Number of worker processes (defaults to the number of CPU cores).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(convert_vdscript_to_llc, **job) for job in jobs]
+        # Wait for every conversion so that any error is raised here
+        for future in futures:
+            future.result()
+
 # Usage example - EDIT THESE VALUES
 if __name__ == "__main__":
     vdscript_filepath = r"C:\New folder\test.vdscript"  # Path to the .vdscript file
@@ -190,3 +255,11 @@ if __name__ == "__main__":
     add_segment_number = False  # Set to True to add segment numbers in the "name" field
 
     convert_vdscript_to_llc(vdscript_filepath, llc_filepath, media_filename, fps, extra_frames_start, extra_frames_end, add_segment_number)
+
+    # Batch example - convert several files in parallel (uncomment and edit to use)
+    # batch_convert([
+    #     {"vdscript_filepath": r"C:\New folder\test1.vdscript", "llc_filepath": r"C:\New folder\test1.llc",
+    #      "media_filename": "test1.mp4", "fps": 25, "extra_frames_start": 0, "extra_frames_end": 0},
+    #     {"vdscript_filepath": r"C:\New folder\test2.vdscript", "llc_filepath": r"C:\New folder\test2.llc",
+    #      "media_filename": "test2.mp4", "fps": 25, "extra_frames_start": 0, "extra_frames_end": 0},
+    # ])